@@ -13,113 +13,170 @@ Key Updates:
 """
 
 import streamlit as st
-import PyPDF2
-from typing import List
-from pydantic import BaseModel, Field
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import fitz  # PyMuPDF
+import faiss
+import numpy as np
+import torch
+import httpx
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from sentence_transformers import SentenceTransformer
+import functools
+import html
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, Union
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import Runnable
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_core.globals import set_llm_cache
+from langchain_community.cache import SQLiteCache
 import os
 
+# Structured output models live in their own module: Streamlit re-executes
+# this script on every rerun, which would otherwise redefine the classes and
+# break pickling of cached results and validation in cached chains.
+from models import ResumeFeedback, ResumeScore
 
-# ============================================================================
-# PYDANTIC MODELS FOR STRUCTURED OUTPUT
-# ============================================================================
 
-
-class ResumeAnalysis(BaseModel):
-    """
-    Structured output model for resume analysis.
-    Using Pydantic ensures type safety and consistent output format.
-    """
-
-    match_percentage: int = Field(
-        description="Percentage match between resume and job description (0-100)",
-        ge=0,
-        le=100,
-    )
-    missing_keywords: List[str] = Field(
-        description="List of important keywords missing from the resume (max 20)",
-        max_length=20,
-    )
-    strengths: str = Field(
-        description="Detailed analysis of why the candidate is a good fit"
-    )
-    improvements: str = Field(
-        description="Specific, actionable suggestions to improve the resume"
-    )
-    overall_assessment: str = Field(
-        description="Brief overall assessment of the candidate's fit"
-    )
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
-# HELPER FUNCTIONS
+# LLM RESPONSE CACHE
 # ============================================================================
 
+# Bump whenever the prompt template changes so stale cached answers are
+# never served for a different prompt (the version is part of the prompt
+# text, and therefore part of the cache key).
+PROMPT_VERSION = "2025.2"
 
-def extract_text_from_pdf(uploaded_file) -> str:
-    """
-    Extracts text content from an uploaded PDF file.
+# Identical (resume, job description) pairs are answered from a local SQLite
+# cache instead of paying for another Gemini round-trip.
+LLM_CACHE_PATH = ".resumer_cache.db"
 
-    Args:
-        uploaded_file: Streamlit UploadedFile object
+
+@st.cache_resource(show_spinner=False)
+def get_llm_cache() -> SQLiteCache:
+    """
+    Opens the SQLite LLM cache once per process; Streamlit re-executes this
+    script on every rerun, which would otherwise create a new database
+    engine each time.
 
     Returns:
-        str: Extracted text from all pages of the PDF
+        SQLiteCache: Shared LangChain LLM cache
     """
-    try:
-        pdf_reader = PyPDF2.PdfReader(uploaded_file)
-        text_content = ""
+    return SQLiteCache(database_path=LLM_CACHE_PATH)
 
-        for page in pdf_reader.pages:
-            text_content += page.extract_text() + "\n"
 
-        return text_content.strip()
-    except Exception as e:
-        st.error(f"Error reading PDF: {str(e)}")
-        return ""
+set_llm_cache(get_llm_cache())
 
 
-def analyze_resume(
-    resume_text: str, job_description: str, api_key: str
-) -> ResumeAnalysis:
-    """
-    Analyzes a resume against a job description using Google's Gemini AI.
+# ============================================================================
+# INPUT LIMITS
+# ============================================================================
 
-    This function uses the latest LangChain patterns:
-    - ChatGoogleGenerativeAI for chat-based models
-    - ChatPromptTemplate for modern prompt construction
-    - .with_structured_output() for reliable JSON parsing
+# Upper bound on resume text sent to Gemini (~5K tokens at ~4 characters per
+# token). Keeps pathological uploads, such as long portfolios, from
+# producing huge prompts.
+MAX_RESUME_CHARS = 20_000
+
+# PDF text cleanup, applied before the text reaches the prompt
+SPACES_PATTERN = re.compile(r"[ \t\u00a0]+")
+PAGE_COUNTER_PATTERN = re.compile(
+    r"^\s*Page \d+( of \d+)?\s*$", re.IGNORECASE | re.MULTILINE
+)
+BULLET_ONLY_PATTERN = re.compile(r"^[•●○◦▪■□►▶\-\*·]+$")
+
+# Multi-resume analysis: at most this many PDFs parsed / Gemini requests in
+# flight at once, with requests further paced by a client-side rate limiter.
+# The limiter starts with MAX_CONCURRENCY requests available, so a batch goes
+# out at once, and then refills at REQUESTS_PER_SECOND (120 per minute).
+# That pace is not a Gemini quota: per-model limits depend on the API key's
+# usage tier (https://ai.google.dev/gemini-api/docs/rate-limits). It stays
+# well under the paid-tier limits of SCORE_MODEL and FEEDBACK_MODEL; free-tier
+# keys allow fewer requests per minute, and requests over that quota fail
+# individually with a 429 error.
+MAX_CONCURRENCY = 8
+REQUESTS_PER_SECOND = 2
+
+# Relevance pre-check: inputs below these limits are rejected before any
+# Gemini call is made (the user can still force the analysis)
+MIN_RESUME_CHARS = 200
+MIN_JOB_DESCRIPTION_WORDS = 20
+MIN_TFIDF_SIMILARITY = 0.05
+
+# Token budget for resume + job description in a single request. Inputs are
+# only counted with Gemini's tokenizer when a rough estimate (~4 characters
+# per token) comes close to the budget, so typical inputs cost no extra call
+INPUT_TOKEN_BUDGET = 12_000
+CHARS_PER_TOKEN = 4
+TOKEN_COUNT_THRESHOLD = 0.5
+
+# Job description sections that carry no signal for matching. When over
+# budget, they are dropped up to the next section heading. Only short,
+# heading-like lines (a few words, optionally in markdown emphasis and with
+# a trailing colon) count as headings, so requirement sentences that merely
+# start with "Benefits ..." are kept.
+JD_HEADING_PATTERN = re.compile(
+    r"^(?:#+\s*)?\**\s*(?P<title>[^\W\d_][\w&/'’ ,()-]*?)\s*\**\s*:?\s*\**$"
+)
+JD_HEADING_MAX_WORDS = 5
+JD_BOILERPLATE_HEADING_PATTERN = re.compile(
+    r"about (us|the company)|who we are|our (mission|story|values|culture)"
+    r"|(benefits|perks)( (and|&) (benefits|perks))?|what we offer"
+    r"|why (join|work (with|for)) us|equal (employment )?opportunity( employer)?"
+    r"|eeo( statement)?",
+    re.IGNORECASE,
+)
+# Stripping is abandoned if it would leave less than this fraction of the
+# job description (e.g. an unrecognized layout where no heading ends the
+# boilerplate section)
+JD_MIN_KEPT_FRACTION = 0.5
+
+# Number of parsed PDFs / detailed feedbacks / token counts kept in
+# Streamlit's data cache
+PDF_CACHE_ENTRIES = 64
+FEEDBACK_CACHE_ENTRIES = 64
+TOKEN_COUNT_CACHE_ENTRIES = 256
 
-    Args:
-        resume_text: Text extracted from the resume PDF
-        job_description: Job description provided by the user
-        api_key: Google AI API key
 
-    Returns:
-        ResumeAnalysis: Structured analysis results
-    """
+# ============================================================================
+# MODELS
+# ============================================================================
 
-    # Initialize the model with latest Gemini
-    # Using gemini-2.0-flash for speed and efficiency
-    # Temperature set to 0.3 for more consistent, factual outputs
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-3-flash-preview",
-        google_api_key=api_key,
-        temperature=0.3,
-        convert_system_message_to_human=True,  # For better system message handling
-    )
+# Two-stage cascade: every analysis gets a cheap score from the lite model,
+# and the narrative feedback is only requested from the larger model when
+# the user asks for it
+SCORE_MODEL = "gemini-2.5-flash-lite"
+FEEDBACK_MODEL = "gemini-3-flash-preview"
 
-    # Create a structured output model
-    # This ensures we always get consistent JSON format
-    structured_llm = llm.with_structured_output(ResumeAnalysis)
+# Arguments for the underlying httpx clients: HTTP/2 multiplexes concurrent
+# (batched) requests over one connection, and kept-alive connections skip
+# the TLS handshake on later calls
+HTTP_CLIENT_ARGS = {
+    "http2": True,
+    "limits": httpx.Limits(max_keepalive_connections=20),
+}
 
-    # Modern prompt template using ChatPromptTemplate
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are an expert Application Tracking System (ATS) with deep knowledge of:
+
+# ============================================================================
+# PROMPTS
+# ============================================================================
+
+# The prompt is laid out so that everything static (system role + rubric)
+# forms a fixed prefix and only the resume/job description appear at the
+# tail. Gemini's implicit context caching (and any other provider-side prefix
+# cache) can then reuse the processed prefix across calls.
+
+SYSTEM_PROMPT = f"""You are an expert Application Tracking System (ATS) with deep knowledge of:
 - Software Engineering
 - Data Science & Machine Learning
 - Data Analysis & Business Intelligence
@@ -127,19 +184,11 @@ def analyze_resume(
 - Cloud Computing & DevOps
 - Big Data Engineering
 
-Your task is to provide thorough, accurate, and actionable resume analysis.""",
-            ),
-            (
-                "human",
-                """Analyze the following resume against the job description.
+Your task is to provide thorough, accurate, and actionable resume analysis.
 
-JOB DESCRIPTION:
-{job_description}
+Prompt version: {PROMPT_VERSION}"""
 
-RESUME:
-{resume_text}
-
-Provide a comprehensive analysis with:
+SCORE_INSTRUCTIONS = """You will be given a job description and a resume. Score the resume against the job description:
 
 1. **Match Percentage** (0-100): How well does this resume match the job requirements?
    - Consider skills, experience, education, and achievements
@@ -149,46 +198,1058 @@ Provide a comprehensive analysis with:
    - Technical skills
    - Tools and technologies
    - Relevant certifications
-   - Industry-specific terminology
+   - Industry-specific terminology"""
+
+FEEDBACK_INSTRUCTIONS = """You will be given a job description and a resume. Analyze the resume against the job description.
+
+Provide a comprehensive analysis with:
 
-3. **Strengths**: Explain in detail why this candidate IS a good fit:
+1. **Strengths**: Explain in detail why this candidate IS a good fit:
    - Matching skills and experience
    - Relevant projects or achievements
    - Educational background
    - Transferable skills
 
-4. **Improvements**: Provide specific, actionable recommendations:
+2. **Improvements**: Provide specific, actionable recommendations:
    - How to better highlight existing relevant experience
    - Skills or certifications to acquire
    - Resume formatting or presentation improvements
    - Keywords to add for better ATS optimization
    - Ways to quantify achievements
 
-5. **Overall Assessment**: Provide a brief 2-3 sentence summary of the candidate's overall fit.
+3. **Overall Assessment**: Provide a brief 2-3 sentence summary of the candidate's overall fit.
 
-Remember: The job market is highly competitive. Provide honest, constructive feedback that will genuinely help improve the candidate's chances.""",
-            ),
-        ]
+Remember: The job market is highly competitive. Provide honest, constructive feedback that will genuinely help improve the candidate's chances."""
+
+ANALYSIS_INPUT = """JOB DESCRIPTION:
+{job_description}
+
+RESUME:
+{resume_text}"""
+
+# Static instructions are pre-built messages (not templates) so they are
+# never re-rendered and can never pick up input-dependent text.
+SCORE_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", SYSTEM_PROMPT),
+        HumanMessage(content=SCORE_INSTRUCTIONS),
+        ("human", ANALYSIS_INPUT),
+    ]
+)
+
+FEEDBACK_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", SYSTEM_PROMPT),
+        HumanMessage(content=FEEDBACK_INSTRUCTIONS),
+        ("human", ANALYSIS_INPUT),
+    ]
+)
+
+
+# ============================================================================
+# SEMANTIC RESPONSE CACHE
+# ============================================================================
+
+# Near-duplicate (resume, job description) pairs, such as a resume with a
+# reworded bullet point, reuse a previous score instead of calling Gemini
+# again. It is checked before the SQLite LLM cache above (which only sees the
+# request once it reaches the model), so exact duplicates are normally served
+# from here too, at the cost of loading the embedding model on the first
+# analysis of each process. The SQLite cache still answers exact duplicates
+# when the semantic cache is unavailable, and caches the detailed feedback.
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_DIMENSION = 384
+SEMANTIC_CACHE_DIR = os.path.join(".resumer_semantic_cache", PROMPT_VERSION)
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Nearest resumes checked for a matching job description on each lookup
+SEMANTIC_CACHE_CANDIDATES = 10
+
+# MiniLM only reads the first 256 word pieces of its input, so longer texts
+# are embedded in chunks and mean-pooled
+EMBEDDING_CHUNK_CHARS = 1000
+
+
+@st.cache_resource(show_spinner=False)
+def get_embedder() -> SentenceTransformer:
+    """
+    Loads the sentence-transformer used by the semantic cache, once per
+    process.
+
+    The Linear layers are dynamically quantized to int8, which makes the
+    model roughly 4x smaller and about twice as fast on CPU, so cache
+    lookups are cheap enough to run before every Gemini call.
+
+    Returns:
+        SentenceTransformer: Quantized CPU embedding model
+    """
+    model = SentenceTransformer(EMBEDDING_MODEL, device="cpu")
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def contains_keyword(text: str, keyword: str) -> bool:
+    """
+    Checks whether a keyword appears in a text as a whole word or phrase,
+    ignoring case.
+
+    Args:
+        text: Text to search
+        keyword: Keyword or phrase, such as "Docker" or "CI/CD"
+
+    Returns:
+        bool: True if the text contains the keyword
+    """
+    pattern = r"(?<!\w)" + re.escape(keyword.strip()) + r"(?!\w)"
+    return re.search(pattern, text, re.IGNORECASE) is not None
+
+
+class SemanticCache:
+    """
+    FAISS-backed cache mapping (resume, job description) embeddings to
+    previous ResumeScore results, persisted to disk.
+
+    The index is searched by resume; a candidate only counts as a hit when
+    both its resume and its job description are at least
+    SEMANTIC_CACHE_THRESHOLD similar to the query, so a score computed for
+    a different job posting is never served.
+    """
+
+    def __init__(self, embedder: SentenceTransformer, directory: str):
+        self.embedder = embedder
+        self.index_path = os.path.join(directory, "resumes.faiss")
+        self.job_vectors_path = os.path.join(directory, "job_descriptions.npy")
+        self.results_path = os.path.join(directory, "results.json")
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        if all(
+            os.path.exists(path)
+            for path in (self.index_path, self.job_vectors_path, self.results_path)
+        ):
+            self.index = faiss.read_index(self.index_path)
+            self.job_vectors = np.load(self.job_vectors_path)
+            with open(self.results_path, encoding="utf-8") as f:
+                self.results = [
+                    ResumeScore.model_validate(r) for r in json.load(f)
+                ]
+        else:
+            # fp16 storage halves the index size with no practical loss in
+            # cosine-similarity precision
+            self.index = faiss.IndexScalarQuantizer(
+                EMBEDDING_DIMENSION,
+                faiss.ScalarQuantizer.QT_fp16,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+            self.job_vectors = np.empty((0, EMBEDDING_DIMENSION), dtype="float16")
+            self.results = []
+
+    def _embed_text(self, text: str) -> np.ndarray:
+        chunks = [
+            text[i : i + EMBEDDING_CHUNK_CHARS]
+            for i in range(0, len(text), EMBEDDING_CHUNK_CHARS)
+        ] or [""]
+        vector = np.mean(
+            self.embedder.encode(chunks, normalize_embeddings=True), axis=0
+        )
+        return (vector / (np.linalg.norm(vector) or 1.0)).astype("float32")
+
+    def lookup(
+        self, resume_text: str, job_description: str
+    ) -> Optional[ResumeScore]:
+        """
+        Returns a cached score for a similar pair, or None on a miss.
+        Missing keywords that the resume now contains are left out.
+        """
+        if self.index.ntotal == 0:
+            return None
+
+        resume_vector = self._embed_text(resume_text)
+        job_vector = self._embed_text(job_description)
+        result = None
+        with self._lock:
+            resume_sims, ids = self.index.search(
+                resume_vector.reshape(1, -1),
+                min(SEMANTIC_CACHE_CANDIDATES, self.index.ntotal),
+            )
+
+            # Candidates come back sorted by resume similarity
+            for resume_sim, idx in zip(resume_sims[0], ids[0]):
+                if resume_sim < SEMANTIC_CACHE_THRESHOLD:
+                    break
+                # Skip entries missing from the stored job vectors/results,
+                # e.g. when a crash left the files out of sync
+                if not 0 <= idx < min(len(self.job_vectors), len(self.results)):
+                    continue
+                job_sim = self.job_vectors[idx].astype("float32") @ job_vector
+                if job_sim >= SEMANTIC_CACHE_THRESHOLD:
+                    result = self.results[idx]
+                    break
+
+        if result is None:
+            return None
+
+        # The resume may be a revision that added some of the reported
+        # keywords; never report those as missing again
+        return result.model_copy(
+            update={
+                "missing_keywords": [
+                    keyword
+                    for keyword in result.missing_keywords
+                    if not contains_keyword(resume_text, keyword)
+                ]
+            }
+        )
+
+    def add(self, resume_text: str, job_description: str, result: ResumeScore):
+        """
+        Stores a score and persists the cache to disk.
+        """
+        resume_vector = self._embed_text(resume_text)
+        job_vector = self._embed_text(job_description)
+        with self._lock:
+            self.index.add(resume_vector.reshape(1, -1))
+            self.job_vectors = np.vstack(
+                [self.job_vectors, job_vector.astype("float16")]
+            )
+            self.results.append(result)
+
+            faiss.write_index(self.index, self.index_path)
+            np.save(self.job_vectors_path, self.job_vectors)
+            with open(self.results_path, "w", encoding="utf-8") as f:
+                json.dump([r.model_dump() for r in self.results], f)
+
+
+@st.cache_resource(show_spinner=False)
+def get_semantic_cache() -> SemanticCache:
+    """
+    Returns the process-wide semantic cache.
+
+    Returns:
+        SemanticCache: Shared cache instance
+    """
+    return SemanticCache(get_embedder(), SEMANTIC_CACHE_DIR)
+
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+
+@st.cache_resource(show_spinner=False)
+def get_llm(api_key: str, model: str) -> ChatGoogleGenerativeAI:
+    """
+    Returns a Gemini chat model, created once per API key and model and
+    reused across Streamlit reruns and sessions.
+
+    Args:
+        api_key: Google AI API key
+        model: Gemini model name
+
+    Returns:
+        ChatGoogleGenerativeAI: Shared chat model instance
+    """
+    # Spreads out repeated batches to stay clear of 429 rate-limit errors.
+    # The bucket starts full: InMemoryRateLimiter starts empty, which would
+    # delay the first request by half a second and spread a fresh batch
+    # over several seconds.
+    rate_limiter = InMemoryRateLimiter(
+        requests_per_second=REQUESTS_PER_SECOND,
+        max_bucket_size=MAX_CONCURRENCY,
+    )
+    rate_limiter.available_tokens = rate_limiter.max_bucket_size
+
+    # Temperature set to 0.3 for more consistent, factual outputs
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=api_key,
+        temperature=0.3,
+        convert_system_message_to_human=True,  # For better system message handling
+        cache=True,  # Use the global SQLite LLM cache
+        client_args=HTTP_CLIENT_ARGS,
+        rate_limiter=rate_limiter,
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_score_chain(api_key: str) -> Runnable:
+    """
+    Builds the first-pass scoring chain (prompt -> structured output from the
+    lite model) once per API key, so reruns skip prompt parsing and client
+    initialization.
+
+    Args:
+        api_key: Google AI API key
+
+    Returns:
+        Runnable: Chain producing ResumeScore objects
+    """
+    # Create a structured output model
+    # This ensures we always get consistent JSON format. The JSON schema is
+    # generated here, once per cached chain (module-level code reruns on
+    # every Streamlit rerun); Gemini fills it natively and the dict is
+    # validated back into the model.
+    structured_llm = get_llm(api_key, SCORE_MODEL).with_structured_output(
+        ResumeScore.model_json_schema(), method="json_schema"
+    )
+
+    return SCORE_PROMPT | structured_llm | ResumeScore.model_validate
+
+
+@st.cache_resource(show_spinner=False)
+def get_feedback_chain(api_key: str) -> Runnable:
+    """
+    Builds the detailed feedback chain (prompt -> structured output from the
+    full model) once per API key.
+
+    Args:
+        api_key: Google AI API key
+
+    Returns:
+        Runnable: Chain producing ResumeFeedback objects
+    """
+    structured_llm = get_llm(api_key, FEEDBACK_MODEL).with_structured_output(
+        ResumeFeedback.model_json_schema(), method="json_schema"
+    )
+
+    return FEEDBACK_PROMPT | structured_llm | ResumeFeedback.model_validate
+
+
+def background_executor(max_workers: int = 1) -> ThreadPoolExecutor:
+    """
+    Creates a thread pool whose workers are attached to the current Streamlit
+    script run, so they can use st.cache_* helpers without warnings.
+
+    Args:
+        max_workers: Maximum number of worker threads
+
+    Returns:
+        ThreadPoolExecutor: Executor to be used as a context manager
+    """
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx()),
+    )
+
+
+def check_resume_relevance(resume_text: str, job_description: str) -> Optional[str]:
+    """
+    Cheap local check that catches resumes not worth sending to Gemini:
+    almost no text, or hardly any vocabulary shared with the job description.
+
+    Args:
+        resume_text: Text extracted from the resume PDF
+        job_description: Job description provided by the user
+
+    Returns:
+        Optional[str]: Reason for rejecting the resume, or None if it passes
+    """
+    if len(resume_text) < MIN_RESUME_CHARS:
+        return f"the resume has less than {MIN_RESUME_CHARS} characters of text."
+
+    # The vectorizer is fitted on just this pair, so the IDF weights reflect
+    # the two documents being compared
+    try:
+        tfidf = TfidfVectorizer(stop_words="english").fit_transform(
+            [resume_text, job_description]
+        )
+        similarity = cosine_similarity(tfidf[0], tfidf[1])[0, 0]
+    except ValueError:
+        # Raised when neither text has any non-stop-word terms
+        similarity = 0.0
+
+    if similarity < MIN_TFIDF_SIMILARITY:
+        return (
+            f"it shares very little vocabulary with the job description "
+            f"(similarity {similarity:.2f})."
+        )
+    return None
+
+
+@st.cache_data(show_spinner=False, max_entries=TOKEN_COUNT_CACHE_ENTRIES)
+def count_tokens(text: str, _api_key: str) -> int:
+    """
+    Counts tokens with Gemini's tokenizer (one count_tokens API call per
+    distinct text).
+
+    Args:
+        text: Text to count
+        _api_key: Google AI API key (not part of the cache key)
+
+    Returns:
+        int: Number of tokens
+    """
+    return get_llm(_api_key, SCORE_MODEL).get_num_tokens(text)
+
+
+def job_heading(line: str) -> Optional[str]:
+    """
+    Recognizes section headings in a job description.
+
+    Args:
+        line: One stripped line of the job description
+
+    Returns:
+        Optional[str]: Heading text without markup, or None if the line
+        is not a heading
+    """
+    match = JD_HEADING_PATTERN.match(line)
+    if not match or len(match.group("title").split()) > JD_HEADING_MAX_WORDS:
+        return None
+    return match.group("title")
+
+
+def strip_job_boilerplate(job_description: str) -> str:
+    """
+    Drops company boilerplate sections ("About us", "Benefits", EEO
+    statements, ...) from a job description.
+
+    Args:
+        job_description: Normalized job description
+
+    Returns:
+        str: Job description without boilerplate sections, or unchanged if
+        stripping would remove most of it
+    """
+    kept = []
+    skipping = False
+    for line in job_description.splitlines():
+        heading = job_heading(line)
+        if heading is not None:
+            # Any other heading ends a boilerplate section
+            skipping = bool(JD_BOILERPLATE_HEADING_PATTERN.fullmatch(heading))
+
+        if not skipping:
+            kept.append(line)
+
+    stripped = "\n".join(kept)
+    if len(stripped) < len(job_description) * JD_MIN_KEPT_FRACTION:
+        return job_description
+    return stripped
+
+
+def truncate_to_tokens(text: str, tokens: int, max_tokens: int) -> str:
+    """
+    Shortens text proportionally so it fits in max_tokens.
+
+    Args:
+        text: Text to shorten
+        tokens: Current token count of the text
+        max_tokens: Token count to fit in
+
+    Returns:
+        str: Shortened text (unchanged if it already fits)
+    """
+    if tokens <= max_tokens:
+        return text
+    return text[: int(len(text) * max_tokens / tokens)]
+
+
+def fit_token_budget(
+    resume_text: str, job_description: str, api_key: str
+) -> Tuple[str, str, Optional[Tuple[int, int]]]:
+    """
+    Makes sure the resume and job description fit in INPUT_TOKEN_BUDGET,
+    so oversized inputs never cause a failed (but billed) request.
+
+    The job description is the lower priority input: its boilerplate
+    sections are dropped first, then the resume is truncated (to no less
+    than half the budget), and only then the job description itself.
+
+    Args:
+        resume_text: Normalized resume text
+        job_description: Normalized job description
+        api_key: Google AI API key
+
+    Returns:
+        Tuple[str, str, Optional[Tuple[int, int]]]: Resume text, job
+        description, and (original, final) token counts if they were trimmed
+    """
+    estimated_tokens = (len(resume_text) + len(job_description)) / CHARS_PER_TOKEN
+    if estimated_tokens < INPUT_TOKEN_BUDGET * TOKEN_COUNT_THRESHOLD:
+        return resume_text, job_description, None
+
+    resume_tokens = count_tokens(resume_text, api_key)
+    job_tokens = count_tokens(job_description, api_key)
+    original_tokens = resume_tokens + job_tokens
+    if original_tokens <= INPUT_TOKEN_BUDGET:
+        return resume_text, job_description, None
+
+    job_description = strip_job_boilerplate(job_description)
+    job_tokens = count_tokens(job_description, api_key)
+
+    if resume_tokens + job_tokens > INPUT_TOKEN_BUDGET:
+        max_resume_tokens = max(
+            INPUT_TOKEN_BUDGET - job_tokens, INPUT_TOKEN_BUDGET // 2
+        )
+        resume_text = truncate_to_tokens(
+            resume_text, resume_tokens, max_resume_tokens
+        )
+        resume_tokens = min(resume_tokens, max_resume_tokens)
+
+    if resume_tokens + job_tokens > INPUT_TOKEN_BUDGET:
+        max_job_tokens = INPUT_TOKEN_BUDGET - resume_tokens
+        job_description = truncate_to_tokens(
+            job_description, job_tokens, max_job_tokens
+        )
+        job_tokens = max_job_tokens
+
+    return resume_text, job_description, (original_tokens, resume_tokens + job_tokens)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes whitespace so trivially different inputs share a cache entry.
+
+    Args:
+        text: Raw resume or job description text
+
+    Returns:
+        str: Text with stripped lines and collapsed blank lines
+    """
+    lines = [" ".join(line.split()) for line in text.strip().splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def clean_pdf_page(page_text: str) -> List[str]:
+    """
+    Removes per-page PDF extraction noise: runs of spaces, blank lines,
+    page counters and bullet-only lines.
+
+    Args:
+        page_text: Raw text of one PDF page
+
+    Returns:
+        List[str]: Remaining non-empty lines of the page
+    """
+    page_text = PAGE_COUNTER_PATTERN.sub("", page_text)
+    lines = [SPACES_PATTERN.sub(" ", line).strip() for line in page_text.splitlines()]
+    return [line for line in lines if line and not BULLET_ONLY_PATTERN.match(line)]
+
+
+def compact_pdf_text(page_lines: List[List[str]]) -> str:
+    """
+    Joins cleaned PDF pages, keeping only the first copy of running page
+    headers/footers.
+
+    Args:
+        page_lines: Cleaned lines of each PDF page (see clean_pdf_page)
+
+    Returns:
+        str: Cleaned text of all pages joined together
+    """
+    # Lines at the top or bottom of more than one page are running
+    # headers/footers; keep their first occurrence only
+    edge_counts = Counter(
+        line for lines in page_lines for line in set(lines[:2] + lines[-2:])
     )
+    seen = set()
+    kept = []
+    for lines in page_lines:
+        for idx, line in enumerate(lines):
+            is_edge = idx < 2 or idx >= len(lines) - 2
+            if is_edge and edge_counts[line] > 1:
+                if line in seen:
+                    continue
+                seen.add(line)
+            kept.append(line)
+        kept.append("")  # Page break
+
+    return "\n".join(kept).strip()
+
+
+@st.cache_data(show_spinner=False, max_entries=PDF_CACHE_ENTRIES)
+def extract_text_from_pdf(pdf_bytes: bytes) -> Tuple[str, bool]:
+    """
+    Extracts text content from a PDF file.
+
+    Safe to call from worker threads: it does not touch the Streamlit UI.
+    Results are cached by file content, so re-analyzing the same PDF (e.g.
+    after editing the job description) skips parsing entirely.
+
+    Args:
+        pdf_bytes: Raw bytes of the PDF file
+
+    Returns:
+        Tuple[str, bool]: Extracted text capped at MAX_RESUME_CHARS
+        characters, and whether it had to be truncated
+    """
+    # PyMuPDF extracts text in C, which is much faster than a
+    # pure-Python parser and keeps ligatures/layout intact
+    page_lines = []
+    cleaned_chars = 0
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf:
+        for page in pdf:
+            lines = clean_pdf_page(page.get_text("text"))
+            page_lines.append(lines)
+            cleaned_chars += sum(len(line) + 1 for line in lines)
+
+            # Stop reading pages once the cleaned text fills the budget.
+            # Repeated headers/footers are only removed across pages, so
+            # the compacted text is measured before deciding.
+            if cleaned_chars >= MAX_RESUME_CHARS:
+                cleaned_chars = len(compact_pdf_text(page_lines))
+                if cleaned_chars >= MAX_RESUME_CHARS:
+                    break
+        pages_skipped = len(page_lines) < len(pdf)
+
+    text_content = compact_pdf_text(page_lines)
+    truncated = pages_skipped or len(text_content) > MAX_RESUME_CHARS
+
+    return text_content[:MAX_RESUME_CHARS], truncated
+
+
+def extract_texts_from_pdfs(uploaded_files) -> List[str]:
+    """
+    Extracts text from several uploaded PDF files in parallel.
 
-    # Create the analysis chain
-    analysis_chain = prompt | structured_llm
+    Args:
+        uploaded_files: List of Streamlit UploadedFile objects
+
+    Returns:
+        List[str]: Extracted text per file, in upload order ("" on failure)
+    """
+    with background_executor(max_workers=MAX_CONCURRENCY) as executor:
+        futures = [
+            executor.submit(extract_text_from_pdf, uploaded_file.getvalue())
+            for uploaded_file in uploaded_files
+        ]
+
+    texts = []
+    for uploaded_file, future in zip(uploaded_files, futures):
+        try:
+            text_content, truncated = future.result()
+        except Exception as e:
+            st.error(f"Error reading PDF {uploaded_file.name}: {str(e)}")
+            texts.append("")
+            continue
+
+        if truncated:
+            st.info(
+                f"ℹ️ {uploaded_file.name} is very long; only the first "
+                f"{MAX_RESUME_CHARS:,} characters will be analyzed."
+            )
+        texts.append(text_content)
 
-    # Execute the analysis
+    return texts
+
+
+def score_resumes(
+    resume_texts: List[str], job_description: str, api_key: str
+) -> List[Union[ResumeScore, Exception]]:
+    """
+    Scores one or more resumes against a job description using Google's
+    Gemini AI (first, cheap stage of the analysis).
+
+    This function uses the latest LangChain patterns:
+    - ChatGoogleGenerativeAI for chat-based models
+    - ChatPromptTemplate for modern prompt construction
+    - .with_structured_output() for reliable JSON parsing
+    - .batch() to send the uncached requests concurrently
+
+    Args:
+        resume_texts: Texts extracted from the resume PDFs
+        job_description: Job description provided by the user
+        api_key: Google AI API key
+
+    Returns:
+        List[Union[ResumeScore, Exception]]: Match score and missing keywords
+        per resume, or the error that resume's request failed with
+    """
+
+    job_description = normalize_text(job_description)
+
+    # Trim oversized inputs to the token budget
+    pairs = []
+    for idx, resume_text in enumerate(resume_texts):
+        resume_text, resume_job_description, trimmed = fit_token_budget(
+            normalize_text(resume_text), job_description, api_key
+        )
+        if trimmed:
+            st.write(
+                f"✂️ Resume {idx + 1}: input trimmed from {trimmed[0]:,} to ~{trimmed[1]:,} tokens"
+            )
+        pairs.append((resume_text, resume_job_description))
+
+    # Reuse the score of near-identical pairs where there is one. The
+    # semantic cache is only an optimization: if it fails (model download,
+    # corrupt cache files, ...), every resume simply goes to Gemini.
+    try:
+        semantic_cache = get_semantic_cache()
+        results = [
+            semantic_cache.lookup(resume_text, resume_job_description)
+            for resume_text, resume_job_description in pairs
+        ]
+    except Exception:
+        logger.warning("Semantic cache lookup failed", exc_info=True)
+        semantic_cache = None
+        results = [None] * len(pairs)
+    pending = [idx for idx, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+
+    score_chain = get_score_chain(api_key)
+
+    # Execute the remaining analyses concurrently. The sync batch() runs the
+    # requests on a thread pool; abatch() under asyncio.run() would start a
+    # new event loop per click while the cached model keeps one async HTTP
+    # client, whose pooled connections are bound to the first (closed) loop.
     try:
-        result = analysis_chain.invoke(
-            {"resume_text": resume_text, "job_description": job_description}
+        new_results = score_chain.batch(
+            [
+                {
+                    "resume_text": pairs[idx][0],
+                    "job_description": pairs[idx][1],
+                }
+                for idx in pending
+            ],
+            config={"max_concurrency": MAX_CONCURRENCY},
+            # One failed resume (e.g. a rate limit or invalid output) must
+            # not throw away the results of the others
+            return_exceptions=True,
         )
-        return result
     except Exception as e:
         st.error(f"Error during analysis: {str(e)}")
         raise
 
+    for idx, result in zip(pending, new_results):
+        results[idx] = result
+        if semantic_cache is None or isinstance(result, Exception):
+            continue
+
+        try:
+            semantic_cache.add(*pairs[idx], result)
+        except Exception:
+            logger.warning("Semantic cache update failed", exc_info=True)
+
+    return results
+
+
+@st.cache_data(show_spinner=False, max_entries=FEEDBACK_CACHE_ENTRIES)
+def get_resume_feedback(
+    resume_text: str, job_description: str, _api_key: str
+) -> ResumeFeedback:
+    """
+    Generates detailed feedback for a resume (second, on-demand stage of the
+    analysis). Results are cached per (resume, job description) pair, so
+    reopening the feedback is free.
+
+    Args:
+        resume_text: Text extracted from the resume PDF
+        job_description: Job description provided by the user
+        _api_key: Google AI API key (not part of the cache key)
+
+    Returns:
+        ResumeFeedback: Strengths, improvements and overall assessment
+    """
+    resume_text, job_description, _ = fit_token_budget(
+        normalize_text(resume_text), normalize_text(job_description), _api_key
+    )
+
+    return get_feedback_chain(_api_key).invoke(
+        {"resume_text": resume_text, "job_description": job_description}
+    )
+
 
 # ============================================================================
 # STREAMLIT UI
 # ============================================================================
 
+# Static page content is kept in module-level constants and emitted as one
+# element each, so typing in the inputs (which reruns the script) only
+# re-sends two elements instead of one per heading, paragraph and divider.
+
+PAGE_HEADER_HTML = """
+<style>
+.main-header {
+    font-size: 3rem;
+    font-weight: bold;
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    margin-bottom: 0.5rem;
+}
+.stProgress > div > div > div > div {
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+}
+.keyword-grid {
+    display: grid;
+    grid-template-columns: repeat(3, 1fr);
+    gap: 4px;
+}
+.sidebar-callout {
+    padding: 0.75rem 1rem;
+    border-radius: 0.5rem;
+    /* Text follows the active (light or dark) theme; the translucent
+       backgrounds work on both */
+    color: inherit;
+}
+.sidebar-callout.info {
+    background-color: rgba(28, 131, 225, 0.1);
+}
+.sidebar-callout.warning {
+    background-color: rgba(255, 189, 69, 0.2);
+}
+</style>
+<h1 class="main-header">📄 Resumer.ai</h1>
+<h5>Powered by Google Gemini 3.0 &amp; LangChain</h5>
+<hr>
+"""
+
+SIDEBAR_HTML = """
+<h3>🔑 Get Your API Key</h3>
+<ol>
+    <li>Visit <a href="https://aistudio.google.com/app/apikey" target="_blank">Google AI Studio</a></li>
+    <li>Click "Create API Key"</li>
+    <li>Copy and paste it above</li>
+</ol>
+<hr>
+<h3>ℹ️ About</h3>
+<div class="sidebar-callout info">
+    <p>This app uses Google's <b>Gemini 3.0 Flash</b> model to analyze your resume against job descriptions.</p>
+    <b>Features:</b>
+    <ul>
+        <li>✅ ATS Match Scoring</li>
+        <li>🔍 Keyword Analysis</li>
+        <li>💪 Strength Identification</li>
+        <li>📈 Improvement Suggestions</li>
+    </ul>
+</div>
+<hr>
+<h3>⚠️ Note</h3>
+<div class="sidebar-callout warning">
+    AI-powered analysis may occasionally produce unexpected results.
+    Always review suggestions critically.
+</div>
+<hr>
+<h3>👨‍💻 Credits</h3>
+<p><b>Updated Version (2025)</b></p>
+<ul>
+    <li>Modern LangChain integration</li>
+    <li>Pydantic output parsing</li>
+    <li>Enhanced prompts</li>
+</ul>
+<p><b>Original by:</b> <a href="https://github.com/rahulNetkar" target="_blank">Shreya Chaudhari</a></p>
+"""
+
+
+def build_report(
+    score: ResumeScore, feedback: Optional[ResumeFeedback], resume_name: str
+) -> str:
+    """
+    Builds the plain-text analysis report offered for download.
+
+    Args:
+        score: First-pass match score and missing keywords
+        feedback: Detailed feedback, if it was generated
+        resume_name: Filename of the analyzed resume
+
+    Returns:
+        str: Report contents
+    """
+    if feedback:
+        feedback_report = f"""STRENGTHS:
+{feedback.strengths}
+
+IMPROVEMENTS:
+{feedback.improvements}
+
+OVERALL ASSESSMENT:
+{feedback.overall_assessment}"""
+    else:
+        feedback_report = "Detailed feedback was not generated."
+
+    return f"""
+RESUME ANALYSIS REPORT
+======================
+
+Resume: {resume_name}
+
+Match Score: {score.match_percentage}%
+
+MISSING KEYWORDS:
+{chr(10).join('- ' + k for k in score.missing_keywords)}
+
+{feedback_report}
+
+Generated by Resume Analyzer AI
+Powered by Google Gemini & LangChain
+"""
+
+
+def request_feedback(index: int):
+    """
+    Button callback: marks a resume's detailed feedback as requested.
+
+    Args:
+        index: Position of the resume in the analysis
+    """
+    st.session_state.setdefault("feedback_requested", set()).add(index)
+
+
+def display_feedback_request(index: int, tab_name: str):
+    """
+    Renders the button that triggers the detailed feedback call.
+
+    Args:
+        index: Position of the resume in the analysis
+        tab_name: Name of the tab the button lives in (keeps keys unique)
+    """
+    st.caption("Detailed feedback uses a larger model and is generated on demand.")
+    st.button(
+        "✨ Generate detailed feedback",
+        key=f"feedback_{tab_name}_{index}",
+        on_click=request_feedback,
+        args=(index,),
+    )
+
+
+def request_forced_analysis():
+    """
+    Button callback: reruns the analysis without the relevance pre-check.
+    """
+    st.session_state["force_analysis"] = True
+
+
+def display_force_analysis_button():
+    """
+    Renders the button that overrides the relevance pre-check.
+    """
+    st.button(
+        "Analyze anyway",
+        key="force_analysis_button",
+        on_click=request_forced_analysis,
+        help="Skip the relevance pre-check and send the inputs to Gemini",
+    )
+
+
+def display_results(
+    score: ResumeScore,
+    resume_name: str,
+    resume_text: str,
+    job_description: str,
+    api_key: str,
+    index: int = 0,
+):
+    """
+    Renders the analysis of a single resume as tabs plus a report download.
+
+    The score tabs are shown straight away; the strengths, improvements and
+    overall assessment tabs only call Gemini once the user asks for them.
+
+    Args:
+        score: First-pass match score and missing keywords
+        resume_name: Filename of the analyzed resume
+        resume_text: Text extracted from the resume PDF
+        job_description: Job description provided by the user
+        api_key: Google AI API key
+        index: Position of the resume in the upload (keeps widget keys unique)
+    """
+
+    feedback = None
+    if index in st.session_state.get("feedback_requested", set()):
+        try:
+            with st.spinner("✨ Generating detailed feedback..."):
+                feedback = get_resume_feedback(resume_text, job_description, api_key)
+        except Exception as e:
+            st.error(f"❌ Could not generate detailed feedback: {str(e)}")
+
+    # Create tabs for organized display
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(
+        [
+            "📊 Match Score",
+            "🔑 Missing Keywords",
+            "💪 Strengths",
+            "📈 Improvements",
+            "📝 Overall Assessment",
+        ]
+    )
+
+    with tab1:
+        st.subheader("Match Percentage")
+
+        # Display progress bar with custom color
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            st.progress(score.match_percentage / 100)
+            st.metric(
+                label="Match Score",
+                value=f"{score.match_percentage}%",
+                delta=(
+                    "Good fit" if score.match_percentage >= 70 else "Needs improvement"
+                ),
+            )
+
+        # Interpretation
+        if score.match_percentage >= 80:
+            st.success(
+                "🎉 Excellent match! You're a strong candidate for this position."
+            )
+        elif score.match_percentage >= 60:
+            st.info(
+                "👍 Good match! With some improvements, you could be a top candidate."
+            )
+        else:
+            st.warning(
+                "⚠️ Consider gaining more relevant skills or highlighting your experience better."
+            )
+
+    with tab2:
+        st.subheader("Missing Keywords")
+
+        if score.missing_keywords:
+            st.write("Consider adding these keywords to your resume:")
+
+            # Display in a 3-column grid sent as a single element; keywords
+            # are model output, so they are escaped before going into HTML
+            keyword_items = "".join(
+                f"<div>• <b>{html.escape(keyword)}</b></div>"
+                for keyword in score.missing_keywords
+            )
+            st.markdown(
+                f'<div class="keyword-grid">{keyword_items}</div>',
+                unsafe_allow_html=True,
+            )
+        else:
+            st.success("✅ No major keywords missing!")
+
+    with tab3:
+        st.subheader("Your Strengths")
+        if feedback:
+            st.markdown(feedback.strengths)
+        else:
+            display_feedback_request(index, "strengths")
+
+    with tab4:
+        st.subheader("Recommended Improvements")
+        if feedback:
+            st.markdown(feedback.improvements)
+        else:
+            display_feedback_request(index, "improvements")
+
+    with tab5:
+        st.subheader("Overall Assessment")
+        if feedback:
+            st.info(feedback.overall_assessment)
+        else:
+            display_feedback_request(index, "assessment")
+
+    # Download button for results
+    st.markdown("---")
+
+    # The report is only built when the user actually clicks download
+    report_name = os.path.splitext(resume_name)[0]
+    st.download_button(
+        label="📥 Download Analysis Report",
+        data=functools.partial(build_report, score, feedback, resume_name),
+        file_name=f"{report_name}_analysis_report.txt",
+        mime="text/plain",
+        use_container_width=True,
+        key=f"download_report_{index}",
+    )
+
 
 def main():
     """
@@ -204,30 +1265,8 @@ def main():
         initial_sidebar_state="expanded",
     )
 
-    # Custom CSS for better styling
-    st.markdown(
-        """
-        <style>
-        .main-header {
-            font-size: 3rem;
-            font-weight: bold;
-            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            margin-bottom: 0.5rem;
-        }
-        .stProgress > div > div > div > div {
-            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        }
-        </style>
-    """,
-        unsafe_allow_html=True,
-    )
-
-    # Main header
-    st.markdown('<h1 class="main-header">📄 Resumer.ai</h1>', unsafe_allow_html=True)
-    st.markdown("##### Powered by Google Gemini 3.0 & LangChain")
-    st.markdown("---")
+    # Custom CSS and page header, sent as a single element
+    st.markdown(PAGE_HEADER_HTML, unsafe_allow_html=True)
 
     # Sidebar for API key and information
     with st.sidebar:
@@ -241,67 +1280,23 @@ def main():
             help="Get your free API key from Google AI Studio",
         )
 
-        st.markdown("### 🔑 Get Your API Key")
-        st.markdown(
-            """
-        1. Visit [Google AI Studio](https://aistudio.google.com/app/apikey)
-        2. Click "Create API Key"
-        3. Copy and paste it above
-        """
-        )
-
-        st.markdown("---")
-
-        st.markdown("### ℹ️ About")
-        st.info(
-            """
-        This app uses Google's **Gemini 3.0 Flash** model to analyze your resume against job descriptions.
-        
-        **Features:**
-        - ✅ ATS Match Scoring
-        - 🔍 Keyword Analysis
-        - 💪 Strength Identification
-        - 📈 Improvement Suggestions
-        """
-        )
-
-        st.markdown("---")
-
-        st.markdown("### ⚠️ Note")
-        st.warning(
-            """
-        AI-powered analysis may occasionally produce unexpected results. 
-        Always review suggestions critically.
-        """
-        )
-
-        st.markdown("---")
-
-        st.markdown("### 👨‍💻 Credits")
-        st.markdown(
-            """
-        **Updated Version (2025)**
-        - Modern LangChain integration
-        - Pydantic output parsing
-        - Enhanced prompts
-        
-        **Original by:** [Shreya Chaudhari](https://github.com/rahulNetkar)
-        """
-        )
+        # Static sidebar content, sent as a single element
+        st.html(SIDEBAR_HTML)
 
     # Main content area
     col1, col2 = st.columns([1, 1], gap="large")
 
     with col1:
         st.subheader("📤 Upload Resume")
-        uploaded_file = st.file_uploader(
-            "Choose a PDF file",
+        uploaded_files = st.file_uploader(
+            "Choose PDF files",
             type=["pdf"],
-            help="Upload your resume in PDF format",
+            accept_multiple_files=True,
+            help="Upload one or more resumes in PDF format",
             label_visibility="collapsed",
         )
 
-        if uploaded_file:
+        for uploaded_file in uploaded_files:
             st.success(f"✅ Uploaded: {uploaded_file.name}")
 
             # Show file details
@@ -310,7 +1305,7 @@ def main():
                 "File size": f"{uploaded_file.size / 1024:.2f} KB",
                 "File type": uploaded_file.type,
             }
-            with st.expander("📋 File Details"):
+            with st.expander(f"📋 File Details: {uploaded_file.name}"):
                 for key, value in file_details.items():
                     st.text(f"{key}: {value}")
 
@@ -337,151 +1332,169 @@ def main():
             "🚀 Analyze Resume", type="primary", use_container_width=True
         )
 
+    # Set by the "Analyze anyway" button after a rejected pre-check
+    force_analysis = st.session_state.pop("force_analysis", False)
+
     # Analysis logic
-    if analyze_button:
+    if analyze_button or force_analysis:
         # Validation
         if not api_key:
             st.error("⚠️ Please enter your Google AI API key in the sidebar.")
             return
 
-        if not uploaded_file:
-            st.error("⚠️ Please upload a resume PDF file.")
+        if not uploaded_files:
+            st.error("⚠️ Please upload at least one resume PDF file.")
             return
 
         if not job_description:
             st.error("⚠️ Please paste the job description.")
             return
 
+        if (
+            not force_analysis
+            and len(job_description.split()) < MIN_JOB_DESCRIPTION_WORDS
+        ):
+            st.warning(
+                f"⚠️ The job description is too short (under {MIN_JOB_DESCRIPTION_WORDS} words) for a meaningful analysis."
+            )
+            display_force_analysis_button()
+            return
+
         # Show progress
         with st.spinner("🔍 Analyzing your resume... This may take 10-30 seconds."):
             try:
-                # Extract text from PDF
-                with st.status("Extracting text from PDF...", expanded=True) as status:
-                    resume_text = extract_text_from_pdf(uploaded_file)
-
-                    if not resume_text:
-                        st.error(
-                            "Could not extract text from PDF. Please ensure the PDF contains readable text."
+                with background_executor() as executor:
+                    # Build the Gemini chain in the background so it overlaps
+                    # with PDF parsing instead of adding to it
+                    chain_future = executor.submit(get_score_chain, api_key)
+
+                    # Extract text from PDFs
+                    with st.status(
+                        "Extracting text from PDF...", expanded=True
+                    ) as status:
+                        resume_texts = extract_texts_from_pdfs(uploaded_files)
+
+                        resumes = []
+                        rejected = False
+                        for uploaded_file, resume_text in zip(
+                            uploaded_files, resume_texts
+                        ):
+                            if not resume_text:
+                                st.error(
+                                    f"Could not extract text from {uploaded_file.name}. Please ensure the PDF contains readable text."
+                                )
+                                continue
+
+                            st.write(
+                                f"✅ {uploaded_file.name}: extracted {len(resume_text)} characters"
+                            )
+
+                            # Skip Gemini for obviously unmatching resumes
+                            reason = (
+                                None
+                                if force_analysis
+                                else check_resume_relevance(
+                                    resume_text, job_description
+                                )
+                            )
+                            if reason:
+                                st.warning(
+                                    f"⚠️ Skipping {uploaded_file.name}: {reason}"
+                                )
+                                rejected = True
+                                continue
+
+                            resumes.append((uploaded_file.name, resume_text))
+
+                        if rejected:
+                            display_force_analysis_button()
+
+                        if not resumes:
+                            status.update(
+                                label="No resume to analyze", state="error"
+                            )
+                            return
+
+                        status.update(
+                            label="Text extraction complete!", state="complete"
                         )
-                        return
 
-                    st.write(f"✅ Extracted {len(resume_text)} characters")
-                    status.update(label="Text extraction complete!", state="complete")
+                    # Re-raises any error from building the chain
+                    chain_future.result()
 
                 # Perform analysis
                 with st.status("Analyzing with Gemini AI...", expanded=True) as status:
-                    result = analyze_resume(resume_text, job_description, api_key)
-                    status.update(label="Analysis complete!", state="complete")
-
-                # Display results
-                st.success("✅ Analysis Complete!")
-                st.markdown("---")
-
-                # Create tabs for organized display
-                tab1, tab2, tab3, tab4, tab5 = st.tabs(
-                    [
-                        "📊 Match Score",
-                        "🔑 Missing Keywords",
-                        "💪 Strengths",
-                        "📈 Improvements",
-                        "📝 Overall Assessment",
-                    ]
-                )
-
-                with tab1:
-                    st.subheader("Match Percentage")
-
-                    # Display progress bar with custom color
-                    col1, col2, col3 = st.columns([1, 2, 1])
-                    with col2:
-                        st.progress(result.match_percentage / 100)
-                        st.metric(
-                            label="Match Score",
-                            value=f"{result.match_percentage}%",
-                            delta=(
-                                "Good fit"
-                                if result.match_percentage >= 70
-                                else "Needs improvement"
-                            ),
-                        )
-
-                    # Interpretation
-                    if result.match_percentage >= 80:
-                        st.success(
-                            "🎉 Excellent match! You're a strong candidate for this position."
-                        )
-                    elif result.match_percentage >= 60:
+                    scores = score_resumes(
+                        [resume_text for _, resume_text in resumes],
+                        job_description,
+                        api_key,
+                    )
+
+                    # Report failed resumes and keep the successful ones
+                    analyzed = []
+                    for (name, resume_text), score in zip(resumes, scores):
+                        if isinstance(score, Exception):
+                            st.error(f"❌ Could not analyze {name}: {str(score)}")
+                            continue
+                        analyzed.append(((name, resume_text), score))
+
+                    if not analyzed:
+                        status.update(label="Analysis failed", state="error")
                         st.info(
-                            "👍 Good match! With some improvements, you could be a top candidate."
+                            "💡 Tip: Try again or check if your API key is valid."
                         )
-                    else:
-                        st.warning(
-                            "⚠️ Consider gaining more relevant skills or highlighting your experience better."
-                        )
-
-                with tab2:
-                    st.subheader("Missing Keywords")
-
-                    if result.missing_keywords:
-                        st.write("Consider adding these keywords to your resume:")
-
-                        # Display in columns for better layout
-                        cols = st.columns(3)
-                        for idx, keyword in enumerate(result.missing_keywords):
-                            with cols[idx % 3]:
-                                st.markdown(f"- **{keyword}**")
-                    else:
-                        st.success("✅ No major keywords missing!")
-
-                with tab3:
-                    st.subheader("Your Strengths")
-                    st.markdown(result.strengths)
-
-                with tab4:
-                    st.subheader("Recommended Improvements")
-                    st.markdown(result.improvements)
-
-                with tab5:
-                    st.subheader("Overall Assessment")
-                    st.info(result.overall_assessment)
-
-                # Download button for results
-                st.markdown("---")
-
-                # Create downloadable report
-                report = f"""
-RESUME ANALYSIS REPORT
-======================
-
-Match Score: {result.match_percentage}%
-
-MISSING KEYWORDS:
-{chr(10).join('- ' + k for k in result.missing_keywords)}
-
-STRENGTHS:
-{result.strengths}
+                        return
 
-IMPROVEMENTS:
-{result.improvements}
+                    resumes = [resume for resume, _ in analyzed]
+                    scores = [score for _, score in analyzed]
+                    status.update(label="Analysis complete!", state="complete")
 
-OVERALL ASSESSMENT:
-{result.overall_assessment}
+                # Keep the results across reruns, so that requesting detailed
+                # feedback does not throw the scores away
+                st.session_state["analysis"] = {
+                    "resumes": resumes,
+                    "job_description": job_description,
+                    "scores": scores,
+                }
+                st.session_state["feedback_requested"] = set()
 
-Generated by Resume Analyzer AI
-Powered by Google Gemini 2.0 & LangChain
-"""
-
-                st.download_button(
-                    label="📥 Download Analysis Report",
-                    data=report,
-                    file_name="resume_analysis_report.txt",
-                    mime="text/plain",
-                    use_container_width=True,
-                )
+                st.success("✅ Analysis Complete!")
 
             except Exception as e:
                 st.error(f"❌ An error occurred: {str(e)}")
                 st.info("💡 Tip: Try again or check if your API key is valid.")
+                return
+
+    # Display results
+    analysis = st.session_state.get("analysis")
+    if analysis:
+        st.markdown("---")
+
+        resumes = analysis["resumes"]
+        if len(resumes) == 1:
+            name, resume_text = resumes[0]
+            display_results(
+                analysis["scores"][0],
+                name,
+                resume_text,
+                analysis["job_description"],
+                api_key,
+            )
+        else:
+            # One tab per resume when several were analyzed
+            resume_tabs = st.tabs([name for name, _ in resumes])
+            for idx, (resume_tab, (name, resume_text), score) in enumerate(
+                zip(resume_tabs, resumes, analysis["scores"])
+            ):
+                with resume_tab:
+                    display_results(
+                        score,
+                        name,
+                        resume_text,
+                        analysis["job_description"],
+                        api_key,
+                        idx,
+                    )
 
 
 if __name__ == "__main__":
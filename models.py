@@ -0,0 +1,40 @@
+"""
+Pydantic models for the structured output of the Resume Analyzer.
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class ResumeScore(BaseModel):
+    """
+    Structured output model for the quick first-pass score.
+    Using Pydantic ensures type safety and consistent output format.
+    """
+
+    match_percentage: int = Field(
+        description="Percentage match between resume and job description (0-100)",
+        ge=0,
+        le=100,
+    )
+    missing_keywords: List[str] = Field(
+        description="List of important keywords missing from the resume (max 20)",
+        max_length=20,
+    )
+
+
+class ResumeFeedback(BaseModel):
+    """
+    Structured output model for the detailed, on-demand feedback.
+    """
+
+    strengths: str = Field(
+        description="Detailed analysis of why the candidate is a good fit"
+    )
+    improvements: str = Field(
+        description="Specific, actionable suggestions to improve the resume"
+    )
+    overall_assessment: str = Field(
+        description="Brief overall assessment of the candidate's fit"
+    )
@@ -0,0 +1,308 @@
+"""
+Tests for the Resume Analyzer helpers that do not need a Gemini API key.
+"""
+
+import os
+import sys
+
+import langchain_google_genai
+import numpy as np
+import pytest
+import streamlit as st
+from langchain_core.runnables import Runnable, RunnableLambda
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+app = pytest.importorskip("app")
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app.py")
+
+
+class FakeScoreChain(Runnable):
+    """
+    Offline score chain returning a fixed score.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, input, config=None, **kwargs):
+        self.calls += 1
+        return app.ResumeScore(match_percentage=50, missing_keywords=["Docker"])
+
+
+def test_gemini_client_uses_http2_keep_alive():
+    llm = app.get_llm.__wrapped__("test-key", app.SCORE_MODEL)
+    api_client = llm.client._api_client
+
+    for httpx_client in (api_client._httpx_client, api_client._async_httpx_client):
+        pool = httpx_client._transport._pool
+        assert pool._http2
+        assert pool._max_keepalive_connections == 20
+
+
+class FakeEmbedder:
+    """
+    Embedder returning fixed unit vectors per text, so similarities between
+    texts are known exactly.
+    """
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def encode(self, chunks, normalize_embeddings=True):
+        return np.array([self.vectors[chunk] for chunk in chunks])
+
+
+def unit_vector(*values):
+    vector = np.zeros(app.EMBEDDING_DIMENSION, dtype="float32")
+    vector[: len(values)] = values
+    return vector / np.linalg.norm(vector)
+
+
+def test_semantic_cache_requires_both_texts_to_match(tmp_path):
+    embedder = FakeEmbedder(
+        {
+            "resume": unit_vector(1.0),
+            "job": unit_vector(0.0, 1.0),
+            # Cosine similarity 0.9 with "job"
+            "other job": unit_vector(0.0, 0.9, np.sqrt(1 - 0.81)),
+        }
+    )
+    cache = app.SemanticCache(embedder, str(tmp_path))
+    score = app.ResumeScore(match_percentage=80, missing_keywords=[])
+    cache.add("resume", "job", score)
+
+    assert cache.lookup("resume", "job") == score
+    # Identical resume, different posting: must not reuse the score even
+    # though the mean similarity (0.95) reaches the threshold
+    assert cache.lookup("resume", "other job") is None
+
+    # The cache is persisted and reloaded from disk
+    reloaded = app.SemanticCache(embedder, str(tmp_path))
+    assert reloaded.lookup("resume", "job") == score
+
+
+class BrokenSemanticCache:
+    """
+    Semantic cache whose every operation fails.
+    """
+
+    def lookup(self, resume_text, job_description):
+        raise IndexError("list index out of range")
+
+    def add(self, resume_text, job_description, result):
+        raise OSError("disk full")
+
+
+def test_semantic_cache_failure_falls_back_to_gemini(monkeypatch):
+    chain = FakeScoreChain()
+    monkeypatch.setattr(app, "get_score_chain", lambda api_key: chain)
+    monkeypatch.setattr(app, "get_semantic_cache", lambda: BrokenSemanticCache())
+
+    results = app.score_resumes(["Python developer"], "Backend engineer", "test-key")
+
+    assert isinstance(results[0], app.ResumeScore)
+    assert chain.calls == 1
+
+
+def test_semantic_cache_ignores_out_of_range_entries(tmp_path):
+    embedder = FakeEmbedder(
+        {"resume": unit_vector(1.0), "job": unit_vector(0.0, 1.0)}
+    )
+    cache = app.SemanticCache(embedder, str(tmp_path))
+    score = app.ResumeScore(match_percentage=80, missing_keywords=[])
+    cache.add("resume", "job", score)
+
+    # Index and results out of sync, as after a crash between writes
+    cache.results = []
+
+    assert cache.lookup("resume", "job") is None
+
+
+def test_padded_pdf_pages_are_not_dropped():
+    fitz = pytest.importorskip("fitz")
+    pdf = fitz.open()
+    for page_number in range(5):
+        page = pdf.new_page()
+        # Wide column gaps: the raw page text is mostly spaces
+        text = "\n".join(
+            f"p{page_number}l{line}" + " " * 150 + "x" for line in range(40)
+        )
+        page.insert_text((20, 20), text, fontsize=8)
+    pdf_bytes = pdf.tobytes()
+    pdf.close()
+
+    text_content, truncated = app.extract_text_from_pdf.__wrapped__(pdf_bytes)
+
+    assert "p4l39 x" in text_content
+    assert not truncated
+
+
+class FakeChatModel:
+    """
+    Offline stand-in for ChatGoogleGenerativeAI returning fixed feedback.
+    """
+
+    def __init__(self, **kwargs):
+        pass
+
+    def get_num_tokens(self, text):
+        return len(text) // app.CHARS_PER_TOKEN
+
+    def with_structured_output(self, schema, method=None):
+        return RunnableLambda(
+            lambda prompt: {
+                "strengths": "Strong Python background",
+                "improvements": "Add Docker",
+                "overall_assessment": "Good fit",
+            }
+        )
+
+
+def test_feedback_across_reruns(monkeypatch):
+    # The script is re-executed as __main__ on every rerun; feedback must
+    # keep working after the first request of the process
+    monkeypatch.setattr(
+        langchain_google_genai, "ChatGoogleGenerativeAI", FakeChatModel
+    )
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    at = AppTest.from_file(APP_PATH, default_timeout=60).run()
+    at.sidebar.text_input[0].set_value("test-key").run()
+
+    for resume_text in ["Python developer", "Go developer"]:
+        at.session_state["analysis"] = {
+            "resumes": [("resume.pdf", resume_text)],
+            "job_description": "Backend engineer with Python and Docker",
+            "scores": [app.ResumeScore(match_percentage=50, missing_keywords=[])],
+        }
+        at.session_state["feedback_requested"] = set()
+        at.run()
+        at.button(key="feedback_strengths_0").click().run()
+
+        assert not at.exception
+        assert not at.error
+        assert "Strong Python background" in [md.value for md in at.markdown]
+
+
+def test_strip_job_boilerplate_stops_at_any_heading():
+    job_description = "\n".join(
+        [
+            "About Us",
+            "We are a fast-growing company founded in 1999.",
+            "Job Summary",
+            "Build backend services for our payments platform.",
+            "Must have:",
+            "- 5 years Python",
+            "- Benefits administration knowledge is a plus",
+            "**Benefits**",
+            "- Health insurance",
+        ]
+    )
+
+    stripped = app.strip_job_boilerplate(job_description)
+
+    assert "fast-growing" not in stripped
+    assert "Health insurance" not in stripped
+    assert "Job Summary" in stripped
+    assert "- 5 years Python" in stripped
+    assert "- Benefits administration knowledge is a plus" in stripped
+
+
+def test_strip_job_boilerplate_keeps_mostly_boilerplate_text():
+    job_description = "About us\n" + "We value curiosity and care.\n" * 20
+    job_description += "Requirements\n- Python"
+
+    assert app.strip_job_boilerplate(job_description) == job_description
+
+
+def test_truncate_to_tokens():
+    assert app.truncate_to_tokens("abcdefgh", 4, 4) == "abcdefgh"
+    assert app.truncate_to_tokens("abcdefgh", 4, 2) == "abcd"
+
+
+def stub_count_tokens(text, api_key):
+    return len(text) // app.CHARS_PER_TOKEN
+
+
+def test_fit_token_budget_skips_small_inputs(monkeypatch):
+    def fail(text, api_key):
+        raise AssertionError("count_tokens should not be called")
+
+    monkeypatch.setattr(app, "count_tokens", fail)
+
+    assert app.fit_token_budget("resume", "job", "test-key") == (
+        "resume",
+        "job",
+        None,
+    )
+
+
+def test_fit_token_budget_strips_boilerplate_then_truncates_resume(monkeypatch):
+    monkeypatch.setattr(app, "count_tokens", stub_count_tokens)
+    resume_text = "Python developer. " * 2500  # 11,250 tokens
+    job_description = "\n".join(
+        ["About us", "We love our customers. " * 200, "Requirements"]
+        + ["- Python and Docker experience"] * 600
+    )
+
+    new_resume, new_job, trimmed = app.fit_token_budget(
+        resume_text, job_description, "test-key"
+    )
+
+    assert "We love our customers" not in new_job
+    assert new_job.startswith("Requirements")
+    assert resume_text.startswith(new_resume)
+    assert len(new_resume) < len(resume_text)
+    final_tokens = stub_count_tokens(new_resume, "") + stub_count_tokens(new_job, "")
+    assert final_tokens <= app.INPUT_TOKEN_BUDGET
+    assert trimmed[0] > app.INPUT_TOKEN_BUDGET >= trimmed[1]
+
+
+def test_fit_token_budget_truncates_job_description_last(monkeypatch):
+    monkeypatch.setattr(app, "count_tokens", stub_count_tokens)
+    resume_text = "Python developer. " * 1000
+    job_description = "- Python and Docker experience\n" * 3000
+
+    new_resume, new_job, trimmed = app.fit_token_budget(
+        resume_text, job_description, "test-key"
+    )
+
+    # The resume fits in half the budget, so only the job description is cut
+    assert new_resume == resume_text
+    assert job_description.startswith(new_job)
+    assert trimmed[1] == app.INPUT_TOKEN_BUDGET
+
+
+def test_semantic_hit_drops_keywords_the_resume_now_has(tmp_path):
+    embedder = FakeEmbedder(
+        {
+            "Python developer": unit_vector(1.0),
+            # Revised resume, still near-identical to the original
+            "Python developer, Docker, CI/CD": unit_vector(1.0),
+            "job": unit_vector(0.0, 1.0),
+        }
+    )
+    cache = app.SemanticCache(embedder, str(tmp_path))
+    score = app.ResumeScore(
+        match_percentage=60, missing_keywords=["Docker", "CI/CD", "Kubernetes"]
+    )
+    cache.add("Python developer", "job", score)
+
+    hit = cache.lookup("Python developer, Docker, CI/CD", "job")
+
+    assert hit.missing_keywords == ["Kubernetes"]
+    assert cache.lookup("Python developer", "job") == score
+
+
+def test_rate_limiter_lets_a_full_batch_through():
+    llm = app.get_llm.__wrapped__("test-key", app.SCORE_MODEL)
+
+    assert all(
+        llm.rate_limiter.acquire(blocking=False)
+        for _ in range(app.MAX_CONCURRENCY)
+    )
+    assert not llm.rate_limiter.acquire(blocking=False)